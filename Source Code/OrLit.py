@@ -29,18 +29,24 @@ from directory_manager2 import (
     get_recent_directories, save_recent_directory, SOURCE_HISTORY_FILE, TARGET_HISTORY_FILE
 )
 from pdf_handler import move_selected_pdfs
+from utils import snapshot_directories
 import subprocess
 import threading
 import time
 import sys  # For PyInstaller compatibility
 import psutil  # To close Excel
 import win32com.client
-from ctypes import windll  # To set the taskbar icon on Windows
+import pythoncom  # COM initialisation for worker threads
+import ctypes
+from ctypes import windll, wintypes  # To set the taskbar icon on Windows
 from tkinter import messagebox
 
 # --- Global Variables ---
 stop_event = threading.Event()  # Event to stop the background process
 background_thread = None  # Track the background thread
+app_root = None  # Main Tk window, so the background thread can post dialogs onto its event loop
+last_excel_close = 0.0  # time.monotonic() of the last click-triggered Excel close
+EXCEL_CLOSE_DEBOUNCE = 0.5  # Seconds; one click fires several close requests
 
 # 🎨 Palette Colors
 BG_COLOR = "#264653"        # Background color (dark blue-green)
@@ -49,6 +55,33 @@ BUTTON_HOVER = "#E76F51"    # Hover color
 TEXT_COLOR = "#FFFFFF"      # White text
 FONT = ("Sans Serif", 12)
 
+# --- Win32 process snapshot (used to check for Excel without starting it) ---
+TH32CS_SNAPPROCESS = 0x00000002
+INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+class PROCESSENTRY32W(ctypes.Structure):
+    _fields_ = [
+        ("dwSize", wintypes.DWORD),
+        ("cntUsage", wintypes.DWORD),
+        ("th32ProcessID", wintypes.DWORD),
+        ("th32DefaultHeapID", ctypes.c_size_t),
+        ("th32ModuleID", wintypes.DWORD),
+        ("cntThreads", wintypes.DWORD),
+        ("th32ParentProcessID", wintypes.DWORD),
+        ("pcPriClassBase", wintypes.LONG),
+        ("dwFlags", wintypes.DWORD),
+        ("szExeFile", wintypes.WCHAR * 260),
+    ]
+
+kernel32 = windll.kernel32
+kernel32.CreateToolhelp32Snapshot.argtypes = [wintypes.DWORD, wintypes.DWORD]
+kernel32.CreateToolhelp32Snapshot.restype = wintypes.HANDLE
+kernel32.Process32FirstW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+kernel32.Process32FirstW.restype = wintypes.BOOL
+kernel32.Process32NextW.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESSENTRY32W)]
+kernel32.Process32NextW.restype = wintypes.BOOL
+kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+
 # Window Icon for OrLit
 def get_icon_path():
     """Get the correct path for the icon in both development and PyInstaller build modes."""
@@ -64,8 +97,31 @@ def get_script_dir():
     """Returns the directory of the current script."""
     return os.path.dirname(os.path.abspath(__file__))
 
+def is_excel_running():
+    """Checks for a running EXCEL.EXE using a single process snapshot."""
+    snapshot = kernel32.CreateToolhelp32Snapshot(TH32CS_SNAPPROCESS, 0)
+    if snapshot == INVALID_HANDLE_VALUE:
+        return True  # Can't tell, so let close_excel ask Excel directly
+
+    try:
+        entry = PROCESSENTRY32W()
+        entry.dwSize = ctypes.sizeof(PROCESSENTRY32W)
+        found = kernel32.Process32FirstW(snapshot, ctypes.byref(entry))
+        while found:
+            if entry.szExeFile.lower() == "excel.exe":
+                return True
+            found = kernel32.Process32NextW(snapshot, ctypes.byref(entry))
+        return False
+    finally:
+        kernel32.CloseHandle(snapshot)
+
 def close_excel():
     """Saves and closes the 'Literature Organisation.xlsx' workbook if open, then quits Excel."""
+    # Dispatch would launch Excel just to look at its workbooks, so skip it when Excel isn't running
+    if not is_excel_running():
+        print("ℹ️ 'Literature Organisation.xlsx' not open.")
+        return
+
     try:
         excel = win32com.client.Dispatch("Excel.Application")
         workbook_found = False
@@ -85,35 +141,42 @@ def close_excel():
     except Exception as e:
         print(f"❌ Failed to close Excel: {e}")
 
+def close_excel_in_background():
+    """Runs close_excel on a worker thread so dropdown and Browse clicks never wait on Excel."""
+    def worker():
+        pythoncom.CoInitialize()  # COM has to be initialised on every thread that uses it
+        try:
+            close_excel()
+        finally:
+            pythoncom.CoUninitialize()
+
+    threading.Thread(target=worker, daemon=True).start()
+
+def close_excel_debounced():
+    """Closes Excel in the background, ignoring repeat requests from the same click."""
+    global last_excel_close
+    now = time.monotonic()
+    if now - last_excel_close < EXCEL_CLOSE_DEBOUNCE:
+        return
+    last_excel_close = now
+    close_excel_in_background()
+
 def browse_directory(entry_var, dropdown, history_file):
     """Opens file dialog for selecting a new directory, closes Excel, and updates dropdown."""
-    close_excel()  # Close Excel as soon as Browse is clicked
+    close_excel_debounced()  # Close Excel as soon as Browse is clicked
     new_dir = filedialog.askdirectory(title="Select Directory")
     
     if new_dir:
         entry_var.set(new_dir)
-        save_recent_directory(history_file, new_dir)
-        update_dropdown(dropdown, new_dir, history_file)
+        update_dropdown(dropdown, new_dir, history_file)  # Also saves the history
 
 def update_dropdown(dropdown, new_entry, history_file):
     """Adds newly selected directories to the dropdown list if not already present."""
     """Update dropdown values dynamically after browsing."""
 
-    save_recent_directory(history_file, new_entry)  # Save it to JSON
-    updated_history = get_recent_directories(history_file)
+    updated_history = save_recent_directory(history_file, new_entry)  # Save it to JSON
     dropdown['values'] = ["📂 Choose a New Directory"] + updated_history
     dropdown.set(new_entry)
-    history = get_recent_directories(history_file)
-
-    # Ensure no duplicates before inserting
-    if new_entry in history:
-        history.remove(new_entry)
-
-    # Add new entry to the top
-    history.insert(0, new_entry)
-
-    # Keep only the last 5 entries
-    history = history[:5]
 
 def update_source_var(source_var, dropdown):
     """Updates source_var with the selected value from the dropdown."""
@@ -121,7 +184,7 @@ def update_source_var(source_var, dropdown):
 
 def on_dropdown_select(entry_var, dropdown, history_file):
     """Closes Excel immediately when interacting with the dropdown."""
-    close_excel()  # Close Excel as soon as the dropdown is clicked
+    close_excel_debounced()  # Close Excel as soon as the dropdown is clicked
     selected_value = dropdown.get()
     
     if selected_value == "📂 Choose a New Directory":
@@ -192,6 +255,13 @@ def accept_changes(source_var, target_var, citation_style_var, source_dropdown,
     stop_event.clear()  # Reset the stop event
     run_main_in_background(source_var, target_var, citation_style_var)
 
+def show_unmatched_warning(unmatched_count):
+    """Shows the 'No Match' warning from the Tk main loop; dialogs must not be opened on the worker thread."""
+    if app_root is not None:
+        app_root.after(0, lambda: messagebox.showwarning(
+            "No Match", f"No matching record found for {unmatched_count} citation file(s)."
+        ))
+
 def run_main_in_background(source_var, target_var, citation_style_var):
     """Runs the main process in the background with proper termination."""
     global background_thread, stop_event
@@ -215,9 +285,18 @@ def run_main_in_background(source_var, target_var, citation_style_var):
         print("🚀 Running main process...")
 
         # Loop with immediate stop on `stop_event`
+        last_snapshot = None
         while not stop_event.is_set():
             try:
-                main(source_directory, target_directory,citation_style)
+                # Only rerun when a file in the source or target directory has changed
+                snapshot = snapshot_directories(source_directory, target_directory)
+                if snapshot is None or snapshot != last_snapshot:
+                    unmatched_count = main(source_directory, target_directory,citation_style)
+                    if unmatched_count:
+                        show_unmatched_warning(unmatched_count)
+                    # Keep the pre-run snapshot: files that arrive while main() runs must still trigger
+                    # a pass (main's own moves cost one extra pass that finds nothing new)
+                    last_snapshot = snapshot
                 
                 # Use `stop_event.wait()` instead of `time.sleep()` for immediate stop
                 if stop_event.wait(timeout=10):  
@@ -252,7 +331,9 @@ def on_leave(e):
 def select_directories():
     close_excel()
     """Displays a UI window for selecting Source & Target directories."""
+    global app_root
     root = tk.Tk()
+    app_root = root
     root.title("OrLit: Simplify, Organize, Discover")
     root.configure(bg=BG_COLOR)  # Full background color
     root.geometry("800x350")  # Increased height for Close button
@@ -307,16 +388,13 @@ def select_directories():
     source_dropdown.grid(row=0, column=1, pady=10, padx=10)
     
     # Added event binding to close Excel on dropdown click
-    source_dropdown.bind("<Button-1>", lambda event: close_excel())
+    source_dropdown.bind("<Button-1>", lambda event: close_excel_debounced())
 
     # 🔥 Added binding to update source_var when dropdown is selected
     source_dropdown.bind("<<ComboboxSelected>>", lambda event: update_source_var(source_var, source_dropdown))
 
     source_button = tk.Button(root, text="Browse", **button_style, command=lambda: browse_directory(source_var, source_dropdown, SOURCE_HISTORY_FILE))
     
-    # Added Excel close on Browse button click
-    source_button.config(command=lambda: (close_excel(), browse_directory(source_var, source_dropdown, SOURCE_HISTORY_FILE)))
-    
     source_button.grid(row=0, column=2, pady=10, padx=10)
 
     source_button.bind("<Enter>", on_enter)
@@ -329,14 +407,11 @@ def select_directories():
     target_dropdown.grid(row=1, column=1, pady=10, padx=10)
     
     # Added event binding to close Excel on dropdown click
-    target_dropdown.bind("<Button-1>", lambda event: close_excel())
+    target_dropdown.bind("<Button-1>", lambda event: close_excel_debounced())
     target_dropdown.bind("<<ComboboxSelected>>", lambda event: on_dropdown_select(target_var, target_dropdown, TARGET_HISTORY_FILE))
 
     target_button = tk.Button(root, text="Browse", **button_style, command=lambda: browse_directory(target_var, target_dropdown, TARGET_HISTORY_FILE))
     
-    # Added Excel close on Browse button click
-    target_button.config(command=lambda: (close_excel(), browse_directory(target_var, target_dropdown, TARGET_HISTORY_FILE)))
-    
     target_button.grid(row=1, column=2, pady=10, padx=10)
 
     target_button.bind("<Enter>", on_enter)
@@ -20,28 +20,69 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from datetime import datetime
 import os
-import sys
 import re
+from collections import OrderedDict
+from utils import get_file_creation_date
 
+# RIS / NBIB tags ("TI  - value") and the field each one fills
+RIS_FIELDS = {
+    'TI': 'Title', 'T1': 'Title',
+    'AU': 'Authors', 'FAU': 'Authors', 'A1': 'Authors',
+    'DA': 'Publication Date', 'DP': 'Publication Date', 'Y1': 'Publication Date',
+    'AB': 'Abstract', 'N2': 'Abstract',
+    'DO': 'DOI', 'LID': 'DOI',
+    'JO': 'Journal', 'JT': 'Journal', 'JOUR': 'Journal',
+    'VL': 'Volume', 'VI': 'Volume',
+    'IS': 'Issue', 'IP': 'Issue',
+}
 
-def get_file_creation_date(file_path):
-    """Get the file creation date cross-platform."""
-    if sys.platform == "win32":  
-        # Windows: Use getctime (creation time)
-        creation_timestamp = os.path.getctime(file_path)
-    elif sys.platform == "darwin":  
-        # macOS: Use st_birthtime (actual file creation date)
-        creation_timestamp = os.stat(file_path).st_birthtime
-    else:  
-        # Linux: No creation date, fallback to earliest modification time
-        creation_timestamp = os.path.getmtime(file_path)
+# EndNote tags ("%T value")
+ENW_FIELDS = {
+    'T': 'Title', 'A': 'Authors', 'D': 'Publication Date', 'M': 'DOI',
+    '0': 'Journal', 'V': 'Volume', 'N': 'Issue', '@': 'Pages',
+}
+
+# BibTeX keys ("title = {value}")
+BIB_FIELDS = {
+    'title': 'Title', 'author': 'Authors', 'year': 'Publication Date', 'abstract': 'Abstract',
+    'doi': 'DOI', 'journal': 'Journal', 'volume': 'Volume', 'number': 'Issue', 'issue': 'Issue',
+    'pages': 'Pages',
+}
+
+# One pass over the whole file matches every supported tag in all three formats
+CITATION_PATTERN = re.compile(
+    r'^(?:(?P<ris_tag>' + '|'.join(RIS_FIELDS) + r')[ \t]+-[ \t]?(?P<ris_val>.*)'
+    r'|%(?P<enw_tag>[' + re.escape(''.join(ENW_FIELDS)) + r']) (?P<enw_val>.*)'
+    r'|[ \t]*(?P<bib_key>(?i:' + '|'.join(BIB_FIELDS) + r'))\s*=\s*[{"](?P<bib_val>.+?)[}"])',
+    re.MULTILINE,
+)
+
+# Each alternative of CITATION_PATTERN ends in its own value group, so match.lastgroup
+# picks the tag group and field table without testing the formats one by one
+FORMAT_GROUPS = {
+    'ris_val': ('ris_tag', RIS_FIELDS),
+    'enw_val': ('enw_tag', ENW_FIELDS),
+    'bib_val': ('bib_key', BIB_FIELDS),
+}
+
+# Characters stripped from every parsed field
+STRIP_TABLE = str.maketrans('', '', '{},[]')
+
+# Parsed results keyed by (path, mtime, size), so an unchanged file is never parsed twice
+PARSE_CACHE_SIZE = 2048
+_parse_cache = OrderedDict()
 
-    return datetime.fromtimestamp(creation_timestamp).strftime('%b %d %Y')  # Format: Mar 11 2025
 
 def parse_citation_file(citation_path):
     """Extract relevant data from a citation file."""
+    stat = os.stat(citation_path)
+    cache_key = (citation_path, stat.st_mtime_ns, stat.st_size)
+    cached = _parse_cache.get(cache_key)
+    if cached is not None:
+        _parse_cache.move_to_end(cache_key)
+        return cached.copy()
+
     access_date = get_file_creation_date(citation_path)  # Get the correct creation date
 
     data = {
@@ -63,107 +104,42 @@ def parse_citation_file(citation_path):
 
     authors = []
     with open(citation_path, 'r', encoding='utf-8') as file:
-        for line in file:
-            #Extract Title
-            if line.startswith(('T1  -', 'TI  -')):  
-                data['Title'] = re.split(r'[-=]', line, 1)[-1].strip()
-            elif line.startswith(('%T')):
-                data['Title'] = re.split(r'[T]', line, 1)[-1].strip()
-            elif 'title =' in line.lower():
-                match = re.search(r'title\s*=\s*[{"](.+?)[}"],?', line, re.IGNORECASE)
-                if match:
-                    data['Title'] = match.group(1).strip()
-            # Extract Authors
-            elif line.startswith(('AU  -', 'FAU -','A1  -')):  
-                authors.append(re.split(r'[-=]', line, 1)[-1].strip())
-                data['Authors'] = authors
-            elif line.startswith(('%A')):  
-                authors.append(re.split(r'[=A]', line, 1)[-1].strip())
-                data['Authors'] = authors
-            elif line.strip().startswith('author ='):
-                # Extract the part inside curly braces
-                author_line = re.search(r'author\s*=\s*{(.+?)}', line, re.IGNORECASE)
-                if author_line:
-                    # Split by ' and ' (BibTeX format) and strip spaces
-                    split_authors = [a.strip() for a in author_line.group(1).split(' and ')]
-                    authors.extend(split_authors)
-                    data['Authors'] = authors
-            # Extract Publication Date
-            elif line.startswith(('DA  -', 'DP  -','Y1  -')):  
-                data['Publication Date'] = re.split(r'[-=]', line, 1)[-1].strip()
-            elif line.startswith(('%D')):  
-                data['Publication Date'] = re.split(r'[D]', line, 1)[-1].strip()
-            elif 'year =' in line:
-                 match = re.search(r'year\s*=\s*[{"](.+?)[}"]', line, re.IGNORECASE)
-                 if match:
-                    data['Publication Date'] = match.group(1).strip()
-            # Extract Abstract
-            elif line.startswith(('AB  -','N2  -')):  
-                data['Abstract'] = re.split(r'[-=]', line, 1)[-1].strip()
-            elif 'abstract =' in line:
-                match = re.search(r'abstract\s*=\s*[{"](.+?)[}"]', line, re.IGNORECASE)
-                if match:
-                    data['Abstract'] = match.group(1).strip()
-            # Extract DOI
-            elif line.startswith(('DO  -','LID -')):
-                raw_doi = re.split(r'[-=]', line, 1)[-1].strip()
-                data['DOI'] = f"https://doi.org/{raw_doi}" if not raw_doi.startswith("http") else raw_doi
-            elif line.startswith(('%M')):
-                raw_doi = re.split(r'[M]', line, 1)[-1].strip()
-                data['DOI'] = f"https://doi.org/{raw_doi}" if not raw_doi.startswith("http") else raw_doi
-            elif 'doi =' in line:
-                match = re.search(r'doi\s*=\s*[{"](.+?)[}"]', line, re.IGNORECASE)
-                if match:
-                    raw_doi = match.group(1).strip()
-                    data['DOI'] = f"https://doi.org/{raw_doi}" if not raw_doi.startswith("http") else raw_doi
-            # Extract Journal
-            elif line.startswith(('JO  -', 'JT  -', 'JOUR -')):  
-                data['Journal'] = re.split(r'[-=]', line, 1)[-1].strip()
-            elif line.startswith(('PT -','%0')):  
-                data['Journal'] = re.split(r'[-=0]', line, 1)[-1].strip()
-            elif 'journal =' in line:
-                match = re.search(r'journal\s*=\s*[{"](.+?)[}"]', line, re.IGNORECASE)
-                if match:
-                    data['Journal'] = match.group(1).strip()
-            # Extract Volume
-            elif line.startswith(('VL  -','VI -')):  
-                data['Volume'] = re.split(r'[-=]', line, 1)[-1].strip()
-            elif line.startswith(('%V')):  
-                data['Volume'] = re.split(r'[V]', line, 1)[-1].strip()
-            elif 'volume =' in line.lower():
-                match = re.search(r'volume\s*=\s*[{"](.+?)[}"],?', line, re.IGNORECASE)
-                if match:
-                    data['Volume'] = match.group(1).strip()
-            # Extract Issue
-            elif line.startswith(('IP -','IS  -','number =')):  
-                data['Issue'] = re.split(r'[-=]', line, 1)[-1].strip()
-            elif line.startswith(('%N')):  
-                data['Issue'] = re.split(r'[N]', line, 1)[-1].strip()
-            elif 'issue =' in line.lower():
-                match = re.search(r'issue\s*=\s*[{"](.+?)[}"],?', line, re.IGNORECASE)
-                if match:
-                    data['Issue'] = match.group(1).strip()
-            # Extract Page Number
-            elif line.startswith(('issn =','IS -','SN -')):  
-                data['Pages'] = re.split(r'[-=]', line, 1)[-1].strip()
-            elif line.startswith('%@ '):  
-                data['Pages'] = re.split(r'[@]', line, 1)[-1].strip()
-            elif 'pages =' in line.lower():
-                match = re.search(r'pages\s*=\s*[{"](.+?)[}"],?', line, re.IGNORECASE)
-                if match:
-                    data['Pages'] = match.group(1).strip()
-        
+        text = file.read()
+
+    for match in CITATION_PATTERN.finditer(text):
+        value_group = match.lastgroup
+        tag_group, fields = FORMAT_GROUPS[value_group]
+        tag = match.group(tag_group)
+        field = fields.get(tag) or fields[tag.lower()]  # BibTeX keys are case-insensitive
+        value = match.group(value_group).strip()
+
+        if field == 'Authors':
+            if value_group == 'bib_val':
+                # Split by ' and ' (BibTeX format) and strip spaces
+                authors.extend(a.strip() for a in value.split(' and '))
+            else:
+                authors.append(value)
+        elif field == 'DOI':
+            data['DOI'] = f"https://doi.org/{value}" if not value.startswith("http") else value
+        else:
+            data[field] = value
+
     if authors:
+        data['Authors'] = authors
         data['First Author'] = authors[0]
         data['Last Author'] = authors[-1]
 
     # Remove curly braces and commas from all string fields
-    for key in data:
-        if isinstance(data[key], str):
-            data[key] = re.sub(r'[{},\[\]]', '', data[key])
+    for key, value in data.items():
+        if type(value) is str:
+            data[key] = value.translate(STRIP_TABLE)
 
-        elif isinstance(data[key], list):
+        elif type(value) is list:
             # Clean each author name in the list
-            data[key] = [re.sub(r'[{},\[\]]', '', name) for name in data[key]]
-  
+            data[key] = [name.translate(STRIP_TABLE) for name in value]
+
+    _parse_cache[cache_key] = data.copy()
+    if len(_parse_cache) > PARSE_CACHE_SIZE:
+        _parse_cache.popitem(last=False)  # Drop the least recently used entry
+
     return data
@@ -22,57 +22,52 @@
 import os
 import json
 import sys
+from collections import deque
+from utils import read_json_file
 
 # History file names
 SOURCE_HISTORY_FILE = "source_history.json"
 TARGET_HISTORY_FILE = "target_history.json"
 MAX_HISTORY = 5  # Number of recent directories to store
 
+# History folder in the user's home directory, created once at import
+_APP_DIR = os.path.join(os.path.expanduser("~"), ".orlit")
+os.makedirs(_APP_DIR, exist_ok=True)
+_HISTORY_PATHS = {
+    SOURCE_HISTORY_FILE: os.path.join(_APP_DIR, SOURCE_HISTORY_FILE),
+    TARGET_HISTORY_FILE: os.path.join(_APP_DIR, TARGET_HISTORY_FILE),
+}
+
 def get_history_file_path(file_name):
     """Return full path to a history file stored in the user's home directory."""
-    app_dir = os.path.join(os.path.expanduser("~"), ".orlit")
-    os.makedirs(app_dir, exist_ok=True)
-    return os.path.join(app_dir, file_name)
+    return _HISTORY_PATHS.get(file_name) or os.path.join(_APP_DIR, file_name)
 
 def load_recent_directories(file_name):
     """Load the list of recent directories from a JSON file."""
     file_path = get_history_file_path(file_name)
-    
-    if os.path.exists(file_path):
-        with open(file_path, "r") as file:
-            try:
-                return json.load(file)
-            except json.JSONDecodeError:
-                return []
-    return []
 
-def save_recent_directory(file_name, new_dir):
-    # History file names
-    SOURCE_HISTORY_FILE = "source_history.json"
-    TARGET_HISTORY_FILE = "target_history.json"
-    MAX_HISTORY = 5  # Number of recent directories to store
+    try:
+        return read_json_file(file_path)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
 
+def save_recent_directory(file_name, new_dir):
+    """Save a new directory to the recent history, ensuring the most recent is at the top."""
     # ✅ Prevent saving placeholders or empty entries
     if not new_dir or new_dir.strip() == "" or new_dir == "📂 Choose a New Directory":
-        return
-
-    """Save a new directory to the recent history, ensuring the most recent is at the top."""
-    dirs = load_recent_directories(file_name)
-
-    # Remove the directory if it already exists
-    if new_dir in dirs:
-        dirs.remove(new_dir)
-
-    # Add the new directory at the beginning
-    dirs.insert(0, new_dir)
+        return load_recent_directories(file_name)
 
-    # Keep only the latest MAX_HISTORY entries
-    dirs = dirs[:MAX_HISTORY]
+    # Drop any earlier copy of the directory; the bounded deque keeps only the latest MAX_HISTORY entries
+    dirs = deque(maxlen=MAX_HISTORY)
+    dirs.extendleft(reversed([d for d in load_recent_directories(file_name) if d != new_dir]))
+    dirs.appendleft(new_dir)
 
     # Save the updated history back to the file
+    dirs = list(dirs)
     file_path = get_history_file_path(file_name)
     with open(file_path, "w") as file:
         json.dump(dirs, file, indent=4)
+    return dirs
 
 
 def get_recent_directories(file_name):
@@ -19,22 +19,55 @@
 # limitations under the License.
 
 import os
-import pandas as pd
 from openpyxl import load_workbook, Workbook
 from openpyxl.utils import get_column_letter
 import config
 from openpyxl.styles import Alignment
-from datetime import datetime
 from citation_parser2 import parse_citation_file
 from openpyxl.styles import Font
+from openpyxl.cell import WriteOnlyCell
+from utils import parse_creation_date
+
+# Position of each header, so column lookups are a dict access (and a typo raises KeyError)
+HEADER_INDEX = {header: i for i, header in enumerate(config.EXCEL_HEADERS)}
+
+# Columns with a fixed width; every other column is sized to its longest value
+FIXED_COLUMN_WIDTHS = {"Abstract": 75, "Title": 36, "Access Date": 20}
+
+# Shared wrap style for the Abstract and Title columns
+WRAPPED_COLUMNS = ("Abstract", "Title")
+WRAP_TEXT = Alignment(wrap_text=True)
+
+# Excel hyperlink color + underline, shared by every hyperlink cell
+LINK_FONT = Font(color="0563C1", underline="single")
+HYPERLINK_PREFIX = '=HYPERLINK('
+
+# Workbooks kept open between background passes, as last saved: file_path -> (mtime, wb, ws)
+_workbook_cache = {}
+
+def open_for_append(file_path):
+    """Load the Excel file in normal (editable) mode, right before rows are written."""
+    wb = load_workbook(file_path)
+    return wb, wb.active
+
+def load_or_create_excel(file_path, bulk_create=False):
+    """Load or create an Excel file, ensuring proper headers.
+
+    With bulk_create, a missing file comes back as an empty write-only workbook so the first
+    import streams straight to disk; append_data_to_excel writes its header and rows.
+    """
+    # Reuse the workbook from the previous pass unless the file changed on disk since
+    cached = _workbook_cache.get(file_path)
+    if cached is not None and os.path.exists(file_path) and os.path.getmtime(file_path) == cached[0]:
+        return cached[1], cached[2]
+
+    if bulk_create and not os.path.exists(file_path):
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Literature Organisation")
+        return wb, ws
 
-def load_or_create_excel(file_path):
-    """Load or create an Excel file, ensuring proper headers."""
     try:
-        wb = load_workbook(file_path)
-        ws = wb.active
-        existing_df = pd.read_excel(file_path)
-        existing_titles = set(existing_df['Title'].dropna().unique()) if 'Title' in existing_df.columns else set()
+        wb, ws = open_for_append(file_path)
     except Exception:
         print("⚠️ Error loading Excel file. Creating a new one...")
         wb = Workbook()
@@ -42,88 +75,141 @@ def load_or_create_excel(file_path):
         ws.title = "Literature Organisation"
         ws.append(config.EXCEL_HEADERS)
         wb.save(file_path)
-        existing_titles = set()
     
     return wb, ws
 
+def _save_workbook(file_path, wb, ws):
+    """Save the workbook and cache it once it is on disk.
+
+    A PermissionError (the file is open in Excel) propagates with nothing cached, so the next
+    pass reloads the file and appends the rows again; the user's Excel session is never touched.
+    """
+    wb.save(file_path)
+    _workbook_cache[file_path] = (os.path.getmtime(file_path), wb, ws)
+
 def append_data_to_excel(file_path, ws, wb, new_data, target_directory, citation_paths):
     """Append new citation data while preserving formatting."""
-    new_df = pd.DataFrame(new_data)[config.EXCEL_HEADERS]
-
-    if 'Sr No.' not in new_df.columns:
-        new_df['Sr No.'] = None
+    # The workbook is about to hold unsaved rows; _save_workbook caches it again only once they are on disk
+    _workbook_cache.pop(file_path, None)
 
-    # Convert 'Access Date' to datetime for sorting
-    new_df['Access Date'] = pd.to_datetime(new_df['Access Date'], format='%b %d %Y')
-    
-    # Format 'Access Date' to the desired format
-    new_df['Access Date'] = new_df['Access Date'].dt.strftime('%b %d %Y')
-    
     # Define column order based on headers
     column_order = config.EXCEL_HEADERS
+    sr_idx = HEADER_INDEX['Sr. No.']
+    access_idx = HEADER_INDEX['Access Date']
+    title_idx = HEADER_INDEX['Title']
+    doi_idx = HEADER_INDEX['DOI']
 
-    new_df['Sr. No.'] = range(1, len(new_df) + 1)
-    
-    for _, row in new_df.iterrows():
-        row_list = row.tolist()
-        
-        # Get Access Date and create the hyperlink path
-        access_date = row['Access Date']
-        date_folder_path = os.path.join(target_directory, access_date)
+    # Build the rows directly from the parsed records
+    rows = [[record.get(header) for header in column_order] for record in new_data]
+
+    # Validate 'Access Date' once per distinct date; it is already in the desired format
+    access_dates = [row[access_idx] for row in rows]
+    for access_date in set(access_dates):
+        parse_creation_date(access_date)
+
+    # Rows written by this call start right after the current last row (header is row 1)
+    first_new_row = 2 if wb.write_only else ws.max_row + 1
+
+    # Rows share a handful of access dates, so each date's folder path and hyperlink is built once
+    date_folders = {}
+
+    for sr_no, (row_list, access_date) in enumerate(zip(rows, access_dates), first_new_row - 1):
+        folder = date_folders.get(access_date)
+        if folder is None:
+            # Create the hyperlink path from the Access Date
+            date_folder_path = os.path.join(target_directory, access_date)
+            folder = date_folders[access_date] = (date_folder_path, f'=HYPERLINK("{date_folder_path}", "{access_date}")')
+        date_folder_path, access_date_link = folder
         
         # Add hyperlink for Access Date
-        row_list[column_order.index('Access Date')] = f'=HYPERLINK("{date_folder_path}", "{access_date}")'
+        row_list[access_idx] = access_date_link
 
         # Add hyperlink for Title
-        title = row['Title']
+        title = row_list[title_idx]
         citation_filename = citation_paths.get(title, "")
 
         if citation_filename:
             # Build the full citation path 
-            access_date = row['Access Date']
-            date_folder_path = os.path.join(target_directory, access_date)
             full_citation_path = os.path.join(date_folder_path, citation_filename)
 
             # Add the hyperlink to the Title
-            row_list[config.EXCEL_HEADERS.index('Title')] = f'=HYPERLINK("{full_citation_path}", "{title}")'
-        
-        ws.append(row_list)
-        
-        sr_no_cell = ws.cell(row=ws.max_row, column=column_order.index('Sr. No.') + 1)
-        sr_no_cell.value = ws.max_row - 1
+            row_list[title_idx] = f'=HYPERLINK("{full_citation_path}", "{title}")'
+
+        # Add hyperlink for DOI
+        doi = row_list[doi_idx]
+        if doi and doi.startswith("http"):
+            row_list[doi_idx] = f'=HYPERLINK("{doi}", "{doi}")'
+
+        row_list[sr_idx] = sr_no
 
-    # Add hyperlinks to DOI columns
-    if 'DOI' in new_df.columns:
-        new_df['DOI'] = new_df['DOI'].apply(lambda x: f'=HYPERLINK("{x}", "{x}")' if isinstance(x, str) and x.startswith("http") else x)
+    if wb.write_only:
+        write_new_sheet(ws, rows)
+        wb.save(file_path)  # A write-only workbook can only be saved once, so it is never cached
+        print(f"✅ Created {file_path} with {len(new_data)} entries")
+        return
+
+    for row_list in rows:
+        ws.append(row_list)
     
+    widths = measure_column_widths(ws.iter_rows(values_only=True), ws.max_column)
+
     # Preserve column width and enable text wrapping for the Abstract and Title columns
-    for col_idx, column_cells in enumerate(ws.columns, 1):
+    for col_idx, column_name in enumerate(next(ws.iter_rows(max_row=1, values_only=True)), 1):
         col_letter = get_column_letter(col_idx)
-        column_name = ws.cell(row=1, column=col_idx).value
-        
-        if column_name == "Abstract":
-            ws.column_dimensions[col_letter].width = 75  # Set Abstract column width to 75
-            for cell in column_cells:
-                cell.alignment = Alignment(wrap_text=True)  # Enable text wrapping
-        elif column_name == "Title":
-            ws.column_dimensions[col_letter].width = 36  # Set Title column width to 36  
-            for cell in column_cells:
-                cell.alignment = Alignment(wrap_text=True)  # Enable text wrapping
-        elif column_name == "Access Date":
-            ws.column_dimensions[col_letter].width = 20  # Set Access Date column width to 20      
-        else:
-            # Auto-adjust width for other columns
-            max_length = 0
-            for cell in column_cells:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            ws.column_dimensions[col_letter].width = max_length  # Adjust column width dynamically
+        ws.column_dimensions[col_letter].width = FIXED_COLUMN_WIDTHS.get(column_name, widths[col_idx - 1])
+
+        if column_name in WRAPPED_COLUMNS:
+            ws.column_dimensions[col_letter].alignment = WRAP_TEXT  # Default for entries typed in Excel
+            for (cell,) in ws.iter_rows(min_row=first_new_row, min_col=col_idx, max_col=col_idx):
+                cell.alignment = WRAP_TEXT  # Enable text wrapping
     
     # Apply hyperlink styling after appending rows
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row):  # Skip header row
+    for row in ws.iter_rows(min_row=first_new_row, max_row=ws.max_row):  # Earlier rows are already styled
         for cell in row:
-            if isinstance(cell.value, str) and cell.value.startswith('=HYPERLINK('):
-                cell.font = Font(color="0563C1", underline="single")  # Excel hyperlink color + underline
+            if isinstance(cell.value, str) and cell.value.startswith(HYPERLINK_PREFIX):
+                cell.font = LINK_FONT
     
-    wb.save(file_path)
-    print(f"✅ Appended {len(new_df)} new entries to {file_path}")
+    _save_workbook(file_path, wb, ws)
+    print(f"✅ Appended {len(new_data)} new entries to {file_path}")
+
+def measure_column_widths(value_rows, column_count):
+    """Longest value in each column, measured in a single pass over the cell values."""
+    widths = [0] * column_count
+    for row in value_rows:
+        for i, value in enumerate(row):
+            if value:
+                if isinstance(value, str) and value.startswith(HYPERLINK_PREFIX):
+                    value = value.rsplit('"', 2)[-2]  # Measure the link's display text, not the formula
+                length = len(str(value))
+                if length > widths[i]:
+                    widths[i] = length
+    return widths
+
+def write_new_sheet(ws, rows):
+    """Stream the header and rows into an empty write-only sheet with the usual formatting."""
+    headers = config.EXCEL_HEADERS
+    widths = measure_column_widths([headers] + rows, len(headers))
+
+    # Write-only sheets only keep column settings made before the first row is written
+    for col_idx, column_name in enumerate(headers, 1):
+        col_letter = get_column_letter(col_idx)
+        ws.column_dimensions[col_letter].width = FIXED_COLUMN_WIDTHS.get(column_name, widths[col_idx - 1])
+        if column_name in WRAPPED_COLUMNS:
+            ws.column_dimensions[col_letter].alignment = WRAP_TEXT
+
+    ws.append(headers)
+
+    wrapped = {HEADER_INDEX[name] for name in WRAPPED_COLUMNS}
+    for row_list in rows:
+        cells = []
+        for i, value in enumerate(row_list):
+            is_link = isinstance(value, str) and value.startswith(HYPERLINK_PREFIX)
+            if is_link or i in wrapped:
+                # Styled values need a WriteOnlyCell
+                value = WriteOnlyCell(ws, value=value)
+                if is_link:
+                    value.font = LINK_FONT
+                if i in wrapped:
+                    value.alignment = WRAP_TEXT
+            cells.append(value)
+        ws.append(cells)
@@ -20,11 +20,16 @@
 # limitations under the License.
 
 import os
-import shutil
-import sys
-from datetime import datetime
-from tkinter import filedialog, messagebox, Tk
+import pdf_handler
+from utils import get_file_creation_date_from_stat, move_file, log, flush_log
 
+# Citation file extensions (lowercase, without the dot)
+_CIT_EXTS = frozenset(('ris', 'nbib', 'bib', 'enw', 'bibtex'))
+
+def _is_citation(name):
+    """Check a file name against the citation extensions."""
+    _, dot, ext = name.rpartition('.')
+    return bool(dot) and ext.lower() in _CIT_EXTS
 
 def get_directories():
     """Lazy import to avoid circular dependency"""
@@ -33,18 +38,8 @@ def get_directories():
 
 def list_citation_files(folder):
     """List all RIS, NBIB, BIB, and ENW citation files in a folder."""
-    return [os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(('.ris', '.nbib', '.bib', '.enw', '.bibtex'))]
-
-def get_file_creation_date(file_path):
-    """Get the file creation date cross-platform."""
-    if sys.platform == "win32":  
-        creation_timestamp = os.path.getctime(file_path)
-    elif sys.platform == "darwin":  
-        creation_timestamp = os.stat(file_path).st_birthtime
-    else:  
-        creation_timestamp = os.path.getmtime(file_path)
-
-    return datetime.fromtimestamp(creation_timestamp).strftime('%b %d %Y')  # Format: Mar 11 2025
+    with os.scandir(folder) as entries:
+        return [entry.path for entry in entries if _is_citation(entry.name) and entry.is_file()]
 
 def move_files_to_target(source, target):
     """Moves only .ris, .nbib, .bib, and .enw files from the source to the target directory."""
@@ -59,34 +54,28 @@ def move_files_to_target(source, target):
         src_path = os.path.join(source, item)
         dest_path = os.path.join(target, item)
 
-        # Get file extension (lowercase for consistency)
-        file_extension = os.path.splitext(item)[1].lower().strip()
-
         # Move only citation files
-        if file_extension not in (".ris", ".nbib", ".bib", ".enw",".bibtex"):
-            print(f"🚫 Skipping: {item} (Not a citation file)")
+        if not _is_citation(item):
+            log.info("🚫 Skipping: %s (Not a citation file)", item)
             continue  
 
         try:
             if os.path.isdir(src_path):  # Skip directories
-                print(f"🚫 Skipping folder: {item}")
+                log.info("🚫 Skipping folder: %s", item)
                 continue
             else:  # Move only valid citation files
-                shutil.move(src_path, dest_path)
-                print(f"📄 Moved citation file: {item} → {target}")
+                move_file(src_path, dest_path)
+                log.info("📄 Moved citation file: %s → %s", item, target)
         except Exception as e:
-            print(f"❌ Error moving {item}: {e}")
+            log.error("❌ Error moving %s: %s", item, e)
 
-def safe_move(src, dst):
-    try:
-        shutil.move(src, dst)
-        return True
-    except Exception as e:
-        print(f"❌ Error moving {src} → {dst}: {e}")
-        return False
+    flush_log()
 
 def move_selected_pdfs(target):
     """Select and move multiple PDFs into date-organized folders in the target directory."""
+    # Lazy import so library callers such as main7 never load Tk
+    from tkinter import filedialog, messagebox, Tk
+
     # Create root window (invisible, for dialogs)
     root = Tk()
     root.withdraw()
@@ -95,31 +84,8 @@ def move_selected_pdfs(target):
     if not pdf_files:
         return
 
-    failed_files = []
-
-    for pdf in pdf_files:
-        birthdate = get_file_creation_date(pdf)
-        date_folder = os.path.join(target, birthdate)
-
-        if not os.path.exists(date_folder):
-            os.makedirs(date_folder)
-
-        new_file_path = os.path.join(date_folder, os.path.basename(pdf))
-
-        try:
-            # Ensure file is not locked
-            with open(pdf, "rb") as f:
-                f.read(10)
-
-            if safe_move(pdf, new_file_path):
-                print(f"📄 Moved PDF: {os.path.basename(pdf)} → {date_folder}")
-            else:
-                failed_files.append(pdf)
-                print(f"❌ Failed to move: {os.path.basename(pdf)}")
-
-        except Exception as e:
-            failed_files.append(pdf)
-            print(f"❌ Cannot access {pdf}: {e}")
+    # Grouping by date and the (threaded) moves are shared with the GUI's PDF button
+    failed_files = pdf_handler.move_selected_pdfs(pdf_files, target)
 
     if failed_files:
         failed_list = "\n".join([os.path.basename(f) for f in failed_files])
@@ -151,37 +117,48 @@ def organize_files_by_name(directory):
     citation_files = {}
     txt_files = {}
 
-    # Collect all files in the directory
-    for filename in os.listdir(directory):
-        file_path = os.path.join(directory, filename)
-        base_name, ext = os.path.splitext(filename)
+    # Collect all files in the directory (scandir entries carry their own stat data)
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            base_name, dot, ext = entry.name.rpartition('.')
+            if not dot:
+                continue
 
-        # Categorize files by extension
-        if ext.lower() in ('.ris', '.nbib', '.bib', '.enw','.bibtex'):
-            citation_files[base_name] = file_path
-        elif ext.lower() == '.txt':
-            txt_files[base_name] = file_path
+            # Categorize files by extension
+            ext = ext.lower()
+            if ext in _CIT_EXTS:
+                citation_files[base_name] = entry
+            elif ext == 'txt':
+                txt_files[base_name] = entry.path
 
     # Organize files together if they have matching names
-    for base_name, citation_path in citation_files.items():
+    created_folders = set()  # Date folders already made during this pass
+    for base_name, citation_entry in citation_files.items():
+        citation_path = citation_entry.path
+
         # Get the matching .txt file
         txt_path = txt_files.get(base_name)
 
         # Use the creation date of the citation file for organization
-        birthdate = get_file_creation_date(citation_path)
+        birthdate = get_file_creation_date_from_stat(citation_entry.stat())
         date_folder = os.path.join(directory, birthdate)
 
-        if not os.path.exists(date_folder):
-            os.makedirs(date_folder)
+        if birthdate not in created_folders:
+            os.makedirs(date_folder, exist_ok=True)
+            created_folders.add(birthdate)
 
         # Move citation file
-        shutil.move(citation_path, os.path.join(date_folder, os.path.basename(citation_path)))
-        print(f"📂 Organized {os.path.basename(citation_path)} → {date_folder}")
+        move_file(citation_path, os.path.join(date_folder, os.path.basename(citation_path)))
+        log.info("📂 Organized %s → %s", citation_entry.name, date_folder)
 
         # Move matching .txt file (if it exists)
         if txt_path and os.path.exists(txt_path):
-            shutil.move(txt_path, os.path.join(date_folder, os.path.basename(txt_path)))
-            print(f"📄 Organized {os.path.basename(txt_path)} → {date_folder}")
+            move_file(txt_path, os.path.join(date_folder, os.path.basename(txt_path)))
+            log.info("📄 Organized %s → %s", os.path.basename(txt_path), date_folder)
+
+    flush_log()
 
 if __name__ == "__main__":
     source, target = get_directories()
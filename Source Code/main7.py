@@ -22,15 +22,42 @@
 
 import sys
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from file_handler5 import list_citation_files, organize_files_by_name, move_files_to_target
 from excel_manager7 import load_or_create_excel, append_data_to_excel
 from citation_parser2 import parse_citation_file
 from citation_generator import generate_citation
-from utils import is_file_open
+from utils import is_file_open, read_json_file, write_json_atomically
 import config
 import json
-import psutil
-import time
+
+# Directory holding the app's own data files, resolved once at import
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def close_workbook_via_com(output_file_path):
+    """Save and close the workbook through a running Excel instance; return True if it was open."""
+    try:
+        # Lazy import: pywin32 is only available on Windows
+        import pythoncom
+        import win32com.client
+    except ImportError:
+        return False  # No COM support on this platform
+
+    pythoncom.CoInitialize()  # COM has to be initialised on every thread that uses it
+    try:
+        excel = win32com.client.GetActiveObject("Excel.Application")
+        target_path = os.path.normcase(os.path.abspath(output_file_path))
+        for wb in excel.Workbooks:
+            if os.path.normcase(wb.FullName) == target_path:
+                wb.Close(SaveChanges=True)
+                return True
+    except Exception as e:
+        print(f"⚠️ Could not close the workbook through Excel: {e}")
+    finally:
+        excel = wb = None  # Release the COM objects before uninitialising
+        pythoncom.CoUninitialize()
+    return False
 
 def close_excel(output_file_path):
     """
@@ -42,6 +69,15 @@ def close_excel(output_file_path):
     # Extract the Excel file name from the path
     excel_file_name = os.path.basename(output_file_path)
 
+    # Ask the running Excel instance to close just this workbook before scanning processes
+    if close_workbook_via_com(output_file_path):
+        print(f"✅ {excel_file_name} closed successfully.")
+        return
+
+    # Lazy import: only needed when the COM route above could not close the workbook
+    import psutil
+    import time
+
     # Check for open Excel processes
     for proc in psutil.process_iter(['pid', 'name', 'open_files']):
         if proc.info['name'].lower() == "excel.exe":
@@ -60,30 +96,57 @@ def close_excel(output_file_path):
     print(f"ℹ️ {excel_file_name} was not open or already closed.")
 
 # JSON cache file path
-CACHED_TITLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "titles_cache.json")
-def save_titles_to_json(new_titles):
-    """Append new titles to the existing JSON file."""
-    
-    # Load existing titles from JSON if the file exists
-    if os.path.exists(CACHED_TITLES):
-        with open(CACHED_TITLES, "r", encoding="utf-8") as f:
-            try:
-                existing_titles = set(json.load(f))
-            except json.JSONDecodeError:
-                existing_titles = set()
-    else:
-        existing_titles = set()
-
-    # Combine existing and new titles
-    combined_titles = existing_titles.union(new_titles)
-
-    # Save the merged titles back to the JSON file
-    with open(CACHED_TITLES, "w", encoding="utf-8") as f:
-        json.dump(list(combined_titles), f, ensure_ascii=False, indent=4)
+CACHED_TITLES = os.path.join(_SCRIPT_DIR, "titles_cache.json")
+def load_cached_titles():
+    """Load the set of titles processed in earlier runs from the JSON file."""
+    try:
+        return {title for title in read_json_file(CACHED_TITLES) if title}  # Older caches may hold null
+    except (FileNotFoundError, json.JSONDecodeError):
+        return set()
+
+def save_titles_to_json(all_titles):
+    """Write every processed title (earlier runs plus this one) back to the JSON file."""
+    write_json_atomically(CACHED_TITLES, list(all_titles), separators=(",", ":"))
+
+def append_data_records(data_file_path, records):
+    """Append records to the JSON Lines data file, one JSON object per line."""
+    with open(data_file_path, "a", encoding="utf-8") as f:
+        f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+def migrate_data_json(json_file_path, data_file_path):
+    """One-time conversion of the old data.json (a single JSON list) into the JSON Lines file."""
+    try:
+        existing_data = read_json_file(json_file_path)
+    except FileNotFoundError:
+        return
+    except json.JSONDecodeError:
+        existing_data = None
+
+    # Keep an unreadable data.json aside instead of deleting it
+    if not isinstance(existing_data, list):
+        os.replace(json_file_path, json_file_path + ".unreadable")
+        print(f"⚠️ Could not read {json_file_path}; kept it as {json_file_path}.unreadable")
+        return
+
+    # Build the converted file beside the real one and swap it in, so a failure never leaves a partial copy
+    temp_path = data_file_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in existing_data)
+        if os.path.exists(data_file_path):
+            with open(data_file_path, "r", encoding="utf-8") as current:
+                shutil.copyfileobj(current, f)
+    os.replace(temp_path, data_file_path)
+    os.remove(json_file_path)
+
+def write_citation_txt(txt_write):
+    """Write one queued (path, text) citation file."""
+    txt_file_path, text = txt_write
+    with open(txt_file_path, "w", encoding="utf-8") as txt_file:
+        txt_file.write(text)
 
 def main(source_directory, target_directory, citation_style_var):
     print(f"Citation Style: {citation_style_var}")
-    """Main function to process citation files, move them to target, and store titles in JSON."""
+    """Main function to process citation files, move them to target, and store titles in JSON; returns the number of unmatched citation files."""
 
     if not source_directory or source_directory == "📂 Choose a New Directory":
         print("❌ No source directory selected. Exiting...")
@@ -98,56 +161,78 @@ def main(source_directory, target_directory, citation_style_var):
     move_files_to_target(source_directory, target_directory)
 
     # Excel file path
-    script_directory = os.path.dirname(os.path.abspath(__file__))  
     output_file_path = os.path.join(target_directory, "Literature Organisation.xlsx")
 
-    # Load or create the Excel file
-    wb, ws = load_or_create_excel(output_file_path)
-
     # Get citation files (.ris, .nbib) from the target directory
     citation_files = list_citation_files(target_directory)
 
+    # Titles from earlier runs, loaded once so each duplicate check is a set lookup
+    cached_titles = load_cached_titles()
+
     new_data = []
     new_titles = set()
     citation_paths = {}
+    unmatched_count = 0
+    txt_writes = []  # (txt file path, citation text) pairs written after the loop
 
     for file in citation_files:
         # Extract filename without extension
         base_filename = os.path.splitext(os.path.basename(file))[0]
 
         extracted_data = parse_citation_file(file)
+        title = extracted_data['Title']
 
-        # Add new entries to list
-        if extracted_data['Title'] not in CACHED_TITLES:
-            new_data.append(extracted_data)
-            new_titles.add(extracted_data['Title'])
-
-            # Generate citation
+        # Add new entries to list (untitled records can't be matched by title, so they always count as new)
+        if not title or title not in cached_titles:
+            # Generate citation (an empty record is only counted, never stored)
             intext_citation, bib_reference = generate_citation(extracted_data, citation_style_var)
+            if intext_citation is None:
+                unmatched_count += 1
+                continue
 
-            # Create .txt file with the same name as the citation file
-            txt_filename = f"{base_filename}.txt"
-            txt_file_path = os.path.join(target_directory, txt_filename)
+            new_data.append(extracted_data)
+            if title:
+                new_titles.add(title)
+                cached_titles.add(title)
 
-            # Write citations to the .txt file
-            with open(txt_file_path, "w", encoding="utf-8") as txt_file:
-                txt_file.write(f"------------In Text Citation------------\n {intext_citation}\n\n\n\n\n\n\n")
-                txt_file.write(f"------------Bibliography Reference------------\n {bib_reference}\n")
+            # Queue a .txt file with the same name as the citation file
+            txt_filename = f"{base_filename}.txt"
+            txt_writes.append((
+                os.path.join(target_directory, txt_filename),
+                f"------------In Text Citation------------\n {intext_citation}\n\n\n\n\n\n\n"
+                f"------------Bibliography Reference------------\n {bib_reference}\n",
+            ))
             
-            citation_paths[extracted_data['Title']] = txt_filename
+            if title:
+                citation_paths[title] = txt_filename
+
+    # Write all citation .txt files together; each one is a small, latency-bound write
+    if txt_writes:
+        with ThreadPoolExecutor(max_workers=min(8, len(txt_writes))) as executor:
+            list(executor.map(write_citation_txt, txt_writes))
 
-    # Append new data to Excel file
+    if unmatched_count:
+        print(f"⚠️ No matching record found for {unmatched_count} citation file(s) (no title or authors).")
+
+    # Append new data to Excel file (a first import is written in one streaming pass)
     if new_data:
-        append_data_to_excel(output_file_path, ws, wb, new_data, target_directory, citation_paths)
+        wb, ws = load_or_create_excel(output_file_path, bulk_create=True)
+        try:
+            append_data_to_excel(output_file_path, ws, wb, new_data, target_directory, citation_paths)
+        except PermissionError:
+            # Leave the citation files in place so the next pass picks them up again
+            print(f"⚠️ {config.EXCEL_FILENAME} is open in another program. New citations will be added on the next pass.")
+            return 0  # Unmatched files stay in place too and are reported by that pass
         print(f"✅ Successfully updated {config.EXCEL_FILENAME} with new citations.")
     else:
         print("ℹ️ No new entries found. All citation files were duplicates.")
-
-    wb.save(output_file_path)
+        if not os.path.exists(output_file_path):
+            load_or_create_excel(output_file_path)  # Still leave a workbook with just the headers
 
     # Save the new titles to JSON
     print(f"💾 Saving {len(new_titles)} new titles to JSON...")
-    save_titles_to_json(new_titles)
+    if new_titles:
+        save_titles_to_json(cached_titles)
 
     # Organize files into folders by creation date
     print(f"📂 Organizing files in {target_directory} by creation date...")
@@ -155,36 +240,21 @@ def main(source_directory, target_directory, citation_style_var):
 
     print("✅ File organization complete!")
 
-    # Save all new data to a JSON file 
-    script_directory = os.path.dirname(os.path.abspath(__file__))  
-    data_file_path = os.path.join(script_directory, "data.json")
-
-    # Load existing data if the file exists
-    if os.path.exists(data_file_path):
-        with open(data_file_path, "r", encoding="utf-8") as f:
-            try:
-                existing_data = json.load(f)
-            except json.JSONDecodeError:
-                existing_data = []
-    else:
-        existing_data = []
-
-    # Ensure existing_data is a list
-    if not isinstance(existing_data, list):
-        existing_data = []
+    # Save all new data to a JSON Lines file (only the new records are appended)
+    data_file_path = os.path.join(_SCRIPT_DIR, "data.jsonl")
+    migrate_data_json(os.path.join(_SCRIPT_DIR, "data.json"), data_file_path)
 
-    # Append the new data to the existing list
-    existing_data.extend(new_data)
-
-    # Write the combined data back to the JSON file
-    with open(data_file_path, "w", encoding="utf-8") as f:
-        json.dump(existing_data, f, ensure_ascii=False, indent=4)
+    if new_data:
+        append_data_records(data_file_path, new_data)
 
     # Target Directory Path File
-    target_directory_path_file = os.path.join(script_directory, "target directory path file.txt")
+    target_directory_path_file = os.path.join(_SCRIPT_DIR, "target directory path file.txt")
 
     with open(target_directory_path_file, "w") as f:
         f.write(target_directory)
+
+    # The GUI shows a single warning for these
+    return unmatched_count
     
 
 if __name__ == "__main__":
@@ -18,51 +18,75 @@
 # limitations under the License.
 
 import os
-import shutil
-import sys
-from datetime import datetime
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import utils
+from utils import log, flush_log, move_file
+
+# PDF moves are I/O bound, so larger batches are spread over a few threads
+MIN_PARALLEL_MOVES = 4
+MAX_MOVE_WORKERS = 8
 
 def get_file_creation_date(file_path):
     """Returns the creation date of a file in 'MMM DD YYYY' format (e.g., Mar 11 2025)."""
     try:
-        if sys.platform == "win32":  
-            creation_timestamp = os.path.getctime(file_path)
-        elif sys.platform == "darwin":  
-            creation_timestamp = os.stat(file_path).st_birthtime
-        else:  
-            creation_timestamp = os.path.getmtime(file_path)
-
-        return datetime.fromtimestamp(creation_timestamp).strftime('%b %d %Y')
+        return utils.get_file_creation_date(file_path)
     except Exception as e:
-        print(f"⚠️ Error retrieving creation date for {file_path}: {e}")
+        log.warning("⚠️ Error retrieving creation date for %s: %s", file_path, e)
         return "Unknown Date"  # Default folder if date retrieval fails
 
 def move_selected_pdfs(pdf_files, target_folder):
-    """Moves selected PDF files to their creation date folders in the target directory."""
+    """Moves selected PDF files to their creation date folders in the target directory; returns the PDFs that could not be moved."""
     if not pdf_files or not target_folder:
         print("⚠️ No PDFs selected or target folder not set.")
-        return
+        return []
 
-    if not os.path.exists(target_folder):
-        os.makedirs(target_folder)
+    os.makedirs(target_folder, exist_ok=True)
+    failed_files = []
 
+    # Group the PDFs by creation date so each date folder is created only once
+    pdfs_by_date = defaultdict(list)
     for pdf in pdf_files:
         if not os.path.exists(pdf):
-            print(f"❌ File not found: {pdf}")
+            log.error("❌ File not found: %s", pdf)
+            failed_files.append(pdf)
             continue
-        
+        pdfs_by_date[get_file_creation_date(pdf)].append(pdf)
+
+    moves = []
+    for birthdate, pdfs in pdfs_by_date.items():
+        date_folder = os.path.join(target_folder, birthdate)
+
         try:
-            birthdate = get_file_creation_date(pdf)
-            date_folder = os.path.join(target_folder, birthdate)
+            os.makedirs(date_folder, exist_ok=True)  # Create folder for the birthdate if not exists
+        except Exception as e:
+            log.error("❌ Error creating %s: %s", date_folder, e)
+            failed_files.extend(pdfs)
+            continue
 
-            if not os.path.exists(date_folder):
-                os.makedirs(date_folder)  # Create folder for the birthdate if not exists
+        moves.extend((pdf, date_folder) for pdf in pdfs)
 
-            new_pdf_path = os.path.join(date_folder, os.path.basename(pdf))
-            shutil.move(pdf, new_pdf_path)
-            print(f"📄 Moved PDF: {os.path.basename(pdf)} → {date_folder}")
+    # Small batches are not worth the thread pool start-up
+    if len(moves) < MIN_PARALLEL_MOVES:
+        failed_files.extend(pdf for pdf in map(_move_pdf, moves) if pdf)
+    else:
+        with ThreadPoolExecutor(max_workers=MAX_MOVE_WORKERS) as executor:
+            failed_files.extend(pdf for pdf in executor.map(_move_pdf, moves) if pdf)
 
-        except Exception as e:
-            print(f"❌ Error moving {pdf}: {e}")
+    flush_log()
+    return failed_files
+
+def _move_pdf(move):
+    """Move one PDF into its date folder; returns the PDF path if it could not be moved."""
+    pdf, date_folder = move
+    try:
+        new_pdf_path = os.path.join(date_folder, os.path.basename(pdf))
+        move_file(pdf, new_pdf_path)
+        log.info("📄 Moved PDF: %s → %s", os.path.basename(pdf), date_folder)
+        return None
+
+    except Exception as e:
+        log.error("❌ Error moving %s: %s", pdf, e)
+        return pdf
 
 # Do not execute automatically; just define the functions
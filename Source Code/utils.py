@@ -17,6 +17,45 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import errno
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from datetime import date
+from functools import lru_cache
+from logging.handlers import MemoryHandler
+
+# Date folder names look like "Mar 11 2025"; English month names regardless of the system locale
+_MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+_MONTH_NUMBERS = {month: number for number, month in enumerate(_MONTHS, 1)}
+
+# Creation timestamp picked from a stat result, resolved once for the current platform
+if sys.platform == "win32":
+    # Windows: Use st_ctime (creation time)
+    _stat_creation_timestamp = lambda stat: stat.st_ctime
+elif sys.platform == "darwin":
+    # macOS: Use st_birthtime (actual file creation date)
+    _stat_creation_timestamp = lambda stat: stat.st_birthtime
+else:
+    # Linux: No creation date, fallback to earliest modification time
+    _stat_creation_timestamp = lambda stat: stat.st_mtime
+
+# Per-file progress messages, buffered so big batches don't write to the console line by line
+log = logging.getLogger("orlit")
+log.setLevel(logging.INFO)
+log.propagate = False
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(logging.Formatter("%(message)s"))
+_log_buffer = MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=_console_handler)
+log.addHandler(_log_buffer)
+
+def flush_log():
+    """Write out any buffered progress messages; call at the end of each batch."""
+    _log_buffer.flush()
+
 def is_file_open(file_path):
     """Check if an Excel file is open elsewhere."""
     try:
@@ -24,3 +63,68 @@ def is_file_open(file_path):
             return False
     except PermissionError:
         return True
+
+def snapshot_directories(*directories):
+    """Fingerprint the files directly inside each directory (name, size, mtime), or None if one can't be read."""
+    snapshot = []
+    try:
+        for directory in directories:
+            with os.scandir(directory) as entries:
+                snapshot.append(frozenset(
+                    (entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                    for entry in entries if entry.is_file()
+                ))
+    except OSError:
+        return None
+    return tuple(snapshot)
+
+def get_file_creation_date(file_path):
+    """Get the file creation date cross-platform."""
+    return get_file_creation_date_from_stat(os.stat(file_path))
+
+def get_file_creation_date_from_stat(stat):
+    """Get the file creation date from a stat result the caller already has (e.g. DirEntry.stat())."""
+    return format_creation_date(_stat_creation_timestamp(stat))
+
+@lru_cache(maxsize=4096)
+def format_creation_date(timestamp):
+    """Format a creation timestamp; cached because each citation file is dated by both the parser and the organizer."""
+    # Built by hand: no per-call format parsing, and no locale-dependent month names
+    lt = time.localtime(timestamp)
+    return f"{_MONTHS[lt.tm_mon - 1]} {lt.tm_mday:02d} {lt.tm_year}"
+
+def move_file(src, dst):
+    """Rename src to dst in place, copying only when they are on different drives."""
+    try:
+        os.replace(src, dst)
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+        shutil.move(src, dst)
+
+def read_json_file(file_path):
+    """Read a small JSON file with raw os.read calls, skipping the buffered text reader."""
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        # One read normally covers the whole file; keep reading in case it grew meanwhile
+        chunks = []
+        chunk_size = os.fstat(fd).st_size + 1
+        while chunk := os.read(fd, chunk_size):
+            chunks.append(chunk)
+    finally:
+        os.close(fd)
+    return json.loads(b"".join(chunks))
+
+def parse_creation_date(text):
+    """Parse a date written by format_creation_date, raising ValueError if it is not in that form."""
+    month, day, year = text.split(" ")
+    if month not in _MONTH_NUMBERS:
+        raise ValueError(f"Unknown month in date: {text!r}")
+    return date(int(year), _MONTH_NUMBERS[month], int(day))
+
+def write_json_atomically(file_path, data, **dump_options):
+    """Write JSON to a temporary file and swap it into place, so a crash never leaves a half-written file."""
+    temp_path = file_path + ".tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, **dump_options)
+    os.replace(temp_path, file_path)